@@ -5,90 +5,593 @@ Handles all SQLite database operations using OOP principles.
 
 import sqlite3
 import os
-from typing import List, Optional, Dict, Any, Tuple
+import hashlib
+import hmac
+import json
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Union
 from models import Student, User
 
+# Applied once when the shared connection is opened
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# Users table; also used by _migrate() to rebuild a pre-hashing users table
+USERS_TABLE = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+# Tables and indexes, created in one transaction by initialize_database()
+SCHEMA = f"""
+    BEGIN;
+    
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        roll TEXT UNIQUE NOT NULL,
+        department TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        phone TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    {USERS_TABLE.strip()}
+    
+    CREATE INDEX IF NOT EXISTS idx_students_roll ON students(roll);
+    CREATE INDEX IF NOT EXISTS idx_students_name ON students(name);
+    CREATE INDEX IF NOT EXISTS idx_students_dept_name ON students(department, name);
+    
+    -- Per-department student counts, maintained by the triggers below so
+    -- department listings and counts never have to scan students
+    CREATE TABLE IF NOT EXISTS dept_counts (
+        department TEXT PRIMARY KEY,
+        cnt INTEGER NOT NULL
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS dept_counts_insert AFTER INSERT ON students BEGIN
+        INSERT OR IGNORE INTO dept_counts (department, cnt) VALUES (new.department, 0);
+        UPDATE dept_counts SET cnt = cnt + 1 WHERE department = new.department;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS dept_counts_delete AFTER DELETE ON students BEGIN
+        UPDATE dept_counts SET cnt = cnt - 1 WHERE department = old.department;
+        DELETE FROM dept_counts WHERE department = old.department AND cnt <= 0;
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS dept_counts_update
+    AFTER UPDATE OF department ON students WHEN new.department IS NOT old.department BEGIN
+        UPDATE dept_counts SET cnt = cnt - 1 WHERE department = old.department;
+        DELETE FROM dept_counts WHERE department = old.department AND cnt <= 0;
+        INSERT OR IGNORE INTO dept_counts (department, cnt) VALUES (new.department, 0);
+        UPDATE dept_counts SET cnt = cnt + 1 WHERE department = new.department;
+    END;
+    
+    -- Stamps updated_at on any UPDATE that does not set it explicitly
+    CREATE TRIGGER IF NOT EXISTS students_set_updated_at
+    AFTER UPDATE ON students FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at BEGIN
+        UPDATE students SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END;
+    
+    -- Superseded by idx_students_dept_name, which has department as its prefix
+    DROP INDEX IF EXISTS idx_students_department;
+    CREATE INDEX IF NOT EXISTS idx_students_email ON students(email);
+    
+    COMMIT;
+"""
+
+# External-content FTS5 table kept in sync with students by triggers. The
+# trigram tokenizer matches arbitrary substrings, like the LIKE '%q%' search.
+FTS_SCHEMA = """
+    BEGIN;
+    
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        name, roll, department, email,
+        content='students', content_rowid='id', tokenize='trigram'
+    );
+    
+    CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts(rowid, name, roll, department, email)
+        VALUES (new.id, new.name, new.roll, new.department, new.email);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, name, roll, department, email)
+        VALUES ('delete', old.id, old.name, old.roll, old.department, old.email);
+    END;
+    
+    CREATE TRIGGER IF NOT EXISTS students_fts_update
+    AFTER UPDATE OF name, roll, department, email ON students BEGIN
+        INSERT INTO students_fts(students_fts, rowid, name, roll, department, email)
+        VALUES ('delete', old.id, old.name, old.roll, old.department, old.email);
+        INSERT INTO students_fts(rowid, name, roll, department, email)
+        VALUES (new.id, new.name, new.roll, new.department, new.email);
+    END;
+    
+    COMMIT;
+"""
+
+# Populates a newly created FTS table from existing rows
+FTS_REBUILD = "INSERT INTO students_fts(students_fts) VALUES ('rebuild');"
+
+# Search queries that look like an exact roll number (roll characters with at
+# least one digit) or an email address are tried as point lookups first
+ROLL_QUERY_PATTERN = re.compile(r'^[A-Za-z0-9\-_]*[0-9][A-Za-z0-9\-_]*$')
+EMAIL_QUERY_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+$')
+
+# Shortest query the trigram tokenizer can match
+FTS_MIN_QUERY_LENGTH = 3
+
+# Applied to each read-only pooled connection
+READ_CONNECTION_PRAGMAS = """
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -16000;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# Default maximum number of read-only connections kept by a Database
+READ_POOL_SIZE = os.cpu_count() or 4
+
+# Rows fetched per round trip when streaming large result sets
+FETCH_BATCH_SIZE = 1000
+
+# Size of the per-connection prepared-statement cache (keyed by SQL text)
+STATEMENT_CACHE_SIZE = 64
+
+# Column order expected by Student._from_row
+STUDENT_COLUMNS = 'id, name, roll, department, email, phone'
+
+# SQL statements are module constants so every call passes identical text and
+# reuses the compiled statement from the connection's cache
+SQL_STUDENT_BY_ID = f'SELECT {STUDENT_COLUMNS} FROM students WHERE id = ?'
+SQL_STUDENTS_BY_IDS = f'''
+    SELECT {STUDENT_COLUMNS} FROM students
+    WHERE id IN (SELECT value FROM json_each(?))
+'''
+SQL_STUDENT_BY_ROLL = f'SELECT {STUDENT_COLUMNS} FROM students WHERE roll = ?'
+SQL_STUDENT_BY_EMAIL = f'SELECT {STUDENT_COLUMNS} FROM students WHERE email = ?'
+SQL_ALL_STUDENTS = f'SELECT {STUDENT_COLUMNS} FROM students ORDER BY name, id'
+SQL_STUDENTS_FIRST_PAGE = f'SELECT {STUDENT_COLUMNS} FROM students ORDER BY name, id LIMIT ?'
+SQL_STUDENTS_NEXT_PAGE = f'''
+    SELECT {STUDENT_COLUMNS} FROM students
+    WHERE (name, id) > (?, ?)
+    ORDER BY name, id LIMIT ?
+'''
+SQL_STUDENTS_BY_DEPARTMENT = f'SELECT {STUDENT_COLUMNS} FROM students WHERE department = ? ORDER BY name'
+SQL_SEARCH_STUDENTS = f'''
+    SELECT {STUDENT_COLUMNS} FROM students 
+    WHERE name LIKE :pattern ESCAPE '\\' OR roll LIKE :pattern ESCAPE '\\'
+       OR department LIKE :pattern ESCAPE '\\' OR email LIKE :pattern ESCAPE '\\'
+    ORDER BY name
+'''
+SQL_SEARCH_STUDENTS_FTS = '''
+    SELECT s.id, s.name, s.roll, s.department, s.email, s.phone FROM students s
+    JOIN students_fts f ON f.rowid = s.id
+    WHERE students_fts MATCH ?
+    ORDER BY s.name
+'''
+SQL_DATA_VERSION = 'PRAGMA data_version'
+SQL_DEPARTMENTS = 'SELECT department FROM dept_counts WHERE cnt > 0 ORDER BY department'
+SQL_COUNT_BY_DEPARTMENT = 'SELECT department, cnt FROM dept_counts WHERE cnt > 0 ORDER BY department'
+SQL_INSERT_STUDENT = '''
+    INSERT INTO students (name, roll, department, email, phone)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SQL_INSERT_STUDENT_RETURNING = '''
+    INSERT INTO students (name, roll, department, email, phone)
+    VALUES (?, ?, ?, ?, ?)
+    RETURNING id
+'''
+SQL_UPDATE_STUDENT = '''
+    UPDATE students 
+    SET name = ?, roll = ?, department = ?, email = ?, phone = ?
+    WHERE id = ?
+'''
+SQL_LAST_INSERT_ID = 'SELECT last_insert_rowid()'
+SQL_DELETE_STUDENT = 'DELETE FROM students WHERE id = ?'
+SQL_DELETE_STUDENTS = 'DELETE FROM students WHERE id IN (SELECT value FROM json_each(?))'
+SQL_PASSWORD_HASH_BY_USERNAME = 'SELECT password_hash FROM users WHERE username = ?'
+SQL_INSERT_USER = '''
+    INSERT INTO users (username, password_hash)
+    VALUES (?, ?)
+'''
+SQL_USER_COUNT = 'SELECT COUNT(*) FROM users'
+
+# INSERT ... RETURNING needs SQLite 3.35+; older builds fall back to lastrowid
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Rows written to students before planner statistics are refreshed
+ANALYZE_THRESHOLD = 1000
+
+# Seconds to wait after crossing ANALYZE_THRESHOLD before running ANALYZE, so
+# a burst of writes is followed by a single refresh
+ANALYZE_DELAY = 5.0
+
+# Current schema version, stored in PRAGMA user_version
+# 1: users.password (plaintext) replaced by users.password_hash
+# 2: dept_counts backfilled from existing students
+SCHEMA_VERSION = 2
+
+# PBKDF2-HMAC-SHA256 work factor for stored password hashes
+PASSWORD_HASH_ITERATIONS = 200000
+
+# How long (seconds) a saved login session stays valid
+SESSION_LIFETIME = 7 * 24 * 60 * 60
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password for storage.
+    
+    Args:
+        password: Plaintext password
+        
+    Returns:
+        String of the form 'pbkdf2_sha256$<iterations>$<salt hex>$<digest hex>'
+    """
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, PASSWORD_HASH_ITERATIONS)
+    return f"pbkdf2_sha256${PASSWORD_HASH_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Check a password against a hash produced by hash_password().
+    
+    Args:
+        password: Plaintext password to check
+        password_hash: Stored hash string
+        
+    Returns:
+        True if the password matches
+    """
+    try:
+        algorithm, iterations, salt, digest = password_hash.split('$')
+        if algorithm != 'pbkdf2_sha256':
+            return False
+        candidate = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'),
+                                        bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate.hex(), digest)
+
+
+def like_pattern(text: str) -> str:
+    """
+    Build a LIKE pattern matching text anywhere in a value.
+    
+    % and _ in text are escaped (for use with ESCAPE '\\') so they match
+    literally, the same as the in-memory search in the GUI.
+    
+    Args:
+        text: Substring to search for
+        
+    Returns:
+        LIKE pattern string
+    """
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def exact_lookup_key(query: str) -> Optional[Tuple[str, str]]:
+    """
+    Classify a search query that may name a single student exactly.
+    
+    Used by Database.search_students and the GUI's in-memory search so both
+    take the same fast path with the same normalization.
+    
+    Args:
+        query: Search query
+        
+    Returns:
+        ('roll', upper-cased roll) or ('email', lower-cased email) if the
+        query looks like one, otherwise None
+    """
+    if ROLL_QUERY_PATTERN.match(query):
+        return ('roll', query.strip().upper())
+    if EMAIL_QUERY_PATTERN.match(query):
+        return ('email', query.strip().lower())
+    return None
+
+
+def _session_signature(password_hash: str, username: str, expires: int) -> str:
+    """
+    Sign a session for a user.
+    
+    The stored password hash is the key, so sessions stop verifying once
+    the user's password changes and the key never leaves the database.
+    
+    Args:
+        password_hash: The user's stored password hash
+        username: Username the session is for
+        expires: Expiry time (Unix timestamp)
+        
+    Returns:
+        Hex HMAC-SHA256 signature
+    """
+    payload = f"{username}\n{expires}".encode('utf-8')
+    return hmac.new(password_hash.encode('utf-8'), payload, hashlib.sha256).hexdigest()
+
+
 class Database:
     """
     Database class to handle all SQLite operations.
     Implements CRUD operations for students and users.
     """
     
-    def __init__(self, db_path: str = "students.db"):
+    def __init__(self, db_path: str = "students.db", read_pool_size: int = READ_POOL_SIZE):
         """
         Initialize database connection.
         
+        Reads are served by a pool of read-only connections (WAL mode lets
+        them run concurrently with each other and with the writer); writes go
+        through the single read-write connection under a lock.
+        
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Maximum number of pooled read-only connections
+                (0 serves reads from the read-write connection)
         """
         self.db_path = db_path
         self.connection = None
+        self._write_lock = threading.RLock()
+        self._read_pool = queue.LifoQueue()
+        self._read_pool_size = read_pool_size if db_path != ':memory:' else 0
+        self._read_pool_opened = 0
+        self._read_pool_lock = threading.Lock()
+        
+        # Bumped after every committed student write; together with
+        # PRAGMA data_version (changes from other connections) it keys caches
+        self._write_generation = 0
+        self._departments_cache: Optional[List[str]] = None
+        self._departments_cache_key = None
+        self._rows_changed_since_analyze = 0
+        self._analyze_timer: Optional[threading.Timer] = None
     
     def connect(self) -> sqlite3.Connection:
-        """Establish database connection"""
+        """
+        Return the shared database connection, opening it on first use.
+        
+        The connection is kept open for the lifetime of the Database object so
+        SQLite's page and statement caches are reused across calls.
+        """
+        if self.connection is not None:
+            return self.connection
+        
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Enable column access by name
+            self.connection = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            self.connection.executescript(CONNECTION_PRAGMAS)
             return self.connection
         except sqlite3.Error as e:
+            self.connection = None
             raise Exception(f"Database connection failed: {str(e)}")
     
     def disconnect(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Close database connection (call once on application shutdown)"""
+        with self._read_pool_lock:
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._read_pool_opened = 0
+        
+        with self._write_lock:
+            if self._analyze_timer is not None:
+                self._analyze_timer.cancel()
+                self._analyze_timer = None
+            
+            if self.connection:
+                try:
+                    # Let SQLite refresh planner statistics it considers stale
+                    self.connection.execute('PRAGMA optimize')
+                except sqlite3.Error:
+                    pass
+                self.connection.close()
+                self.connection = None
+        
+        # data_version is only comparable within one connection
+        self._departments_cache = None
     
     def initialize_database(self):
         """Create database tables if they don't exist"""
+        with self._write_lock:
+            self._initialize_database()
+    
+    def _initialize_database(self):
+        """Create and migrate the schema (caller holds the write lock)"""
         try:
             conn = self.connect()
-            cursor = conn.cursor()
             
-            # Create students table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS students (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    roll TEXT UNIQUE NOT NULL,
-                    department TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    phone TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # One script, one transaction; executescript() also keeps these
+            # one-shot statements out of the prepared-statement cache
+            conn.executescript(SCHEMA)
             
-            # Create users table for authentication
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # Full-text index for search_students(); skipped if this SQLite lacks FTS5
+            fts_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'students_fts'"
+            ).fetchone()
+            try:
+                conn.executescript(FTS_SCHEMA if fts_exists else FTS_SCHEMA + FTS_REBUILD)
+            except sqlite3.OperationalError:
+                conn.rollback()
             
-            # Create index for faster searches
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_roll ON students(roll)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_department ON students(department)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_students_email ON students(email)')
-            
-            conn.commit()
-            
-            # Insert default admin user if no users exist
-            cursor.execute('SELECT COUNT(*) FROM users')
-            if cursor.fetchone()[0] == 0:
-                cursor.execute('''
-                    INSERT INTO users (username, password) 
-                    VALUES (?, ?)
-                ''', ('admin', 'admin123'))
-                conn.commit()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute('BEGIN')
+                self._migrate(cursor)
+                
+                # Insert default admin user if no users exist
+                if cursor.execute(SQL_USER_COUNT).fetchone()[0] == 0:
+                    cursor.execute(SQL_INSERT_USER, ('admin', hash_password('admin123')))
             
         except sqlite3.Error as e:
             raise Exception(f"Database initialization failed: {str(e)}")
+    
+    def _migrate(self, cursor: sqlite3.Cursor):
+        """Upgrade an existing database to SCHEMA_VERSION"""
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        
+        if version < 1:
+            # Databases created before password hashing store plaintext passwords
+            columns = [row[1] for row in cursor.execute('PRAGMA table_info(users)')]
+            if 'password' in columns:
+                # Rebuilt rather than RENAME COLUMN, which needs SQLite 3.25+
+                cursor.execute('ALTER TABLE users RENAME TO users_plaintext')
+                cursor.execute(USERS_TABLE)
+                users = cursor.execute(
+                    'SELECT id, username, password, created_at FROM users_plaintext'
+                ).fetchall()
+                cursor.executemany(
+                    'INSERT INTO users (id, username, password_hash, created_at) VALUES (?, ?, ?, ?)',
+                    [(user_id, username, hash_password(password), created_at)
+                     for user_id, username, password, created_at in users]
+                )
+                cursor.execute('DROP TABLE users_plaintext')
+        
+        if version < 2:
+            # dept_counts only tracks rows written after its triggers existed
+            cursor.execute('DELETE FROM dept_counts')
+            cursor.execute('''
+                INSERT INTO dept_counts (department, cnt)
+                SELECT department, COUNT(*) FROM students GROUP BY department
+            ''')
+        
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection for the read pool"""
+        uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.executescript(READ_CONNECTION_PRAGMAS)
+        return conn
+    
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+        
+        Connections are opened on demand up to the pool size; once that many
+        are in use, callers wait for one to be returned. With a pool size of 0
+        the read-write connection is lent out under the write lock, so the
+        with block must not span a yield.
+        """
+        # The writer is opened first so the database is in WAL mode
+        writer = self.connect()
+        if self._read_pool_size == 0:
+            with self._write_lock:
+                yield writer
+            return
+        
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                can_open = self._read_pool_opened < self._read_pool_size
+                if can_open:
+                    self._read_pool_opened += 1
+            if can_open:
+                try:
+                    conn = self._open_read_connection()
+                except sqlite3.Error:
+                    with self._read_pool_lock:
+                        self._read_pool_opened -= 1
+                    raise
+            else:
+                conn = self._read_pool.get()
+        
+        try:
+            yield conn
         finally:
-            self.disconnect()
+            self._read_pool.put(conn)
+    
+    def _fetchone(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        """Run a query on a pooled read connection and return the first row"""
+        with self._read_conn() as conn:
+            return conn.execute(sql, params).fetchone()
+    
+    def _fetchall(self, sql: str, params: Union[Tuple, Dict[str, Any]] = ()) -> List[Tuple]:
+        """Run a query on a pooled read connection and return all rows"""
+        with self._read_conn() as conn:
+            return conn.execute(sql, params).fetchall()
+    
+    def _students_changed(self, row_count: int = 1):
+        """
+        Record a committed write to the students table.
+        
+        Invalidates cached student-derived data, and once ANALYZE_THRESHOLD
+        rows have changed schedules a planner statistics refresh. ANALYZE
+        runs ANALYZE_DELAY seconds later on a timer thread, so the thread
+        that wrote (possibly the GUI thread) never waits for it.
+        """
+        with self._write_lock:
+            self._write_generation += 1
+            self._rows_changed_since_analyze += row_count
+            if self._rows_changed_since_analyze >= ANALYZE_THRESHOLD and self._analyze_timer is None:
+                self._analyze_timer = threading.Timer(ANALYZE_DELAY, self._analyze)
+                self._analyze_timer.daemon = True
+                self._analyze_timer.start()
+    
+    def _analyze(self):
+        """Refresh the students planner statistics (runs on the timer thread)"""
+        with self._write_lock:
+            self._analyze_timer = None
+            if self.connection is None:
+                return  # Disconnected meanwhile
+            self._rows_changed_since_analyze = 0
+            try:
+                self._exec('ANALYZE students')
+            except sqlite3.Error:
+                pass  # Statistics are an optimization; the writes already succeeded
+    
+    def _cache_key(self) -> Tuple[int, int]:
+        """Return a key that changes whenever the students data may have changed"""
+        with self._write_lock:
+            data_version = self._exec(SQL_DATA_VERSION).fetchone()[0]
+            return (data_version, self._write_generation)
+    
+    def _exec(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        """
+        Execute a single statement on the read-write connection.
+        
+        sqlite3 keeps an LRU cache of compiled statements keyed by SQL text,
+        so passing the module-level SQL constants reuses the prepared statement
+        instead of re-parsing it on every call.
+        """
+        return self.connect().execute(sql, params)
+    
+    @staticmethod
+    def _duplicate_student_error(message: str, student: Student) -> Exception:
+        """Translate a UNIQUE constraint violation ('students.<column>') into a user-facing error"""
+        if 'students.roll' in message:
+            return Exception(f"Student with roll number '{student.roll}' already exists")
+        if 'students.email' in message:
+            return Exception(f"Student with email '{student.email}' already exists")
+        return Exception(f"Failed to save student: {message}")
     
     # Student CRUD Operations
     
@@ -105,33 +608,57 @@ class Database:
         Raises:
             Exception: If student with same roll or email already exists
         """
+        params = (student.name, student.roll, student.department, student.email, student.phone)
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            # Check for duplicate roll number
-            cursor.execute('SELECT id FROM students WHERE roll = ?', (student.roll,))
-            if cursor.fetchone():
-                raise Exception(f"Student with roll number '{student.roll}' already exists")
-            
-            # Check for duplicate email
-            cursor.execute('SELECT id FROM students WHERE email = ?', (student.email,))
-            if cursor.fetchone():
-                raise Exception(f"Student with email '{student.email}' already exists")
-            
-            cursor.execute('''
-                INSERT INTO students (name, roll, department, email, phone)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (student.name, student.roll, student.department, student.email, student.phone))
+            # Duplicate roll/email is detected by the UNIQUE constraints
+            with self._write_lock, self.connect():
+                if SUPPORTS_RETURNING:
+                    student_id = self._exec(SQL_INSERT_STUDENT_RETURNING, params).fetchone()[0]
+                else:
+                    student_id = self._exec(SQL_INSERT_STUDENT, params).lastrowid
             
-            student_id = cursor.lastrowid
-            conn.commit()
+            self._students_changed()
             return student_id
             
+        except sqlite3.IntegrityError as e:
+            raise self._duplicate_student_error(str(e), student)
         except sqlite3.Error as e:
             raise Exception(f"Failed to add student: {str(e)}")
-        finally:
-            self.disconnect()
+    
+    def add_students(self, students: List[Student]) -> List[int]:
+        """
+        Add many students in a single transaction.
+        
+        Args:
+            students: Student objects to add
+        
+        Returns:
+            IDs of the inserted students, in input order
+        
+        Raises:
+            Exception: If any student duplicates an existing roll or email
+                (nothing from the batch is inserted in that case)
+        """
+        if not students:
+            return []
+        
+        try:
+            conn = self.connect()
+            with self._write_lock, conn:
+                conn.executemany(SQL_INSERT_STUDENT, [
+                    (s.name, s.roll, s.department, s.email, s.phone) for s in students
+                ])
+                # AUTOINCREMENT ids inside one transaction are consecutive
+                last_id = self._exec(SQL_LAST_INSERT_ID).fetchone()[0]
+            self._students_changed(len(students))
+            
+            first_id = last_id - len(students) + 1
+            return list(range(first_id, last_id + 1))
+        
+        except sqlite3.IntegrityError as e:
+            raise Exception(f"Failed to add students: duplicate roll number or email ({str(e)})")
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to add students: {str(e)}")
     
     def get_student(self, student_id: int) -> Optional[Student]:
         """
@@ -144,41 +671,140 @@ class Database:
             Student object or None if not found
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT * FROM students WHERE id = ?', (student_id,))
-            row = cursor.fetchone()
+            row = self._fetchone(SQL_STUDENT_BY_ID, (student_id,))
             
             if row:
-                return Student.from_dict(dict(row))
+                return Student._from_row(row)
             return None
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get student: {str(e)}")
-        finally:
-            self.disconnect()
+    
+    def get_students(self, student_ids: List[int]) -> List[Student]:
+        """
+        Get several students by ID in a single query.
+        
+        The IDs are passed as one JSON array parameter, so the SQL text (and
+        its cached prepared statement) is the same whatever the list length.
+        
+        Args:
+            student_ids: IDs of the students to retrieve
+            
+        Returns:
+            Student objects in the order of student_ids (unknown IDs are skipped)
+        """
+        if not student_ids:
+            return []
+        
+        try:
+            rows = self._fetchall(SQL_STUDENTS_BY_IDS, (json.dumps(list(student_ids)),))
+            by_id = {row[0]: Student._from_row(row) for row in rows}
+            
+            return [by_id[student_id] for student_id in student_ids if student_id in by_id]
+            
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get students: {str(e)}")
+    
+    def get_student_by_roll(self, roll: str) -> Optional[Student]:
+        """
+        Get a student by roll number.
+        
+        Args:
+            roll: Roll number (matched exactly, after normalizing to upper case)
+            
+        Returns:
+            Student object or None if not found
+        """
+        try:
+            row = self._fetchone(SQL_STUDENT_BY_ROLL, (roll.strip().upper(),))
+            return Student._from_row(row) if row else None
+            
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get student: {str(e)}")
+    
+    def get_student_by_email(self, email: str) -> Optional[Student]:
+        """
+        Get a student by email address.
+        
+        Args:
+            email: Email address (matched exactly, after normalizing to lower case)
+            
+        Returns:
+            Student object or None if not found
+        """
+        try:
+            row = self._fetchone(SQL_STUDENT_BY_EMAIL, (email.strip().lower(),))
+            return Student._from_row(row) if row else None
+            
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get student: {str(e)}")
     
     def get_all_students(self) -> List[Student]:
         """
         Get all students from the database.
         
+        Returns:
+            List of Student objects
+        """
+        return list(self.iter_all_students())
+    
+    def get_students_page(self, limit: int, after: Optional[Student] = None) -> List[Student]:
+        """
+        Get one page of students in (name, id) order.
+        
+        Pages are keyed on the last student of the previous page rather than
+        an OFFSET, so each page is an index range scan and rows added or
+        deleted meanwhile don't shift later pages.
+        
+        Args:
+            limit: Maximum number of students to return
+            after: Last student of the previous page (None for the first page)
+            
         Returns:
             List of Student objects
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            if after is None:
+                rows = self._fetchall(SQL_STUDENTS_FIRST_PAGE, (limit,))
+            else:
+                rows = self._fetchall(SQL_STUDENTS_NEXT_PAGE, (after.name, after.id, limit))
             
-            cursor.execute('SELECT * FROM students ORDER BY name')
-            rows = cursor.fetchall()
+            return [Student._from_row(row) for row in rows]
+            
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to get students: {str(e)}")
+    
+    def iter_all_students(self) -> Iterator[Student]:
+        """
+        Stream all students from the database without materializing them.
+        
+        Rows are pulled from SQLite in batches of FETCH_BATCH_SIZE.
+        
+        Yields:
+            Student objects ordered by name
+        """
+        try:
+            if self._read_pool_size == 0:
+                # Reads share the writer connection under the write lock, which
+                # must not stay held while the caller consumes the generator
+                rows = self._fetchall(SQL_ALL_STUDENTS)
+                for row in rows:
+                    yield Student._from_row(row)
+                return
             
-            return [Student.from_dict(dict(row)) for row in rows]
+            with self._read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = FETCH_BATCH_SIZE
+                cursor.execute(SQL_ALL_STUDENTS)
+                
+                rows = cursor.fetchmany()
+                while rows:
+                    for row in rows:
+                        yield Student._from_row(row)
+                    rows = cursor.fetchmany()
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get students: {str(e)}")
-        finally:
-            self.disconnect()
     
     def update_student(self, student: Student) -> bool:
         """
@@ -194,37 +820,21 @@ class Database:
             Exception: If student not found or duplicate roll/email
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            # Duplicate roll/email is detected by the UNIQUE constraints
+            with self._write_lock, self.connect():
+                cursor = self._exec(SQL_UPDATE_STUDENT, (
+                    student.name, student.roll, student.department, student.email, student.phone, student.id
+                ))
             
-            # Check if student exists
-            cursor.execute('SELECT id FROM students WHERE id = ?', (student.id,))
-            if not cursor.fetchone():
+            if cursor.rowcount == 0:
                 raise Exception("Student not found")
+            self._students_changed()
+            return True
             
-            # Check for duplicate roll number (excluding current student)
-            cursor.execute('SELECT id FROM students WHERE roll = ? AND id != ?', (student.roll, student.id))
-            if cursor.fetchone():
-                raise Exception(f"Student with roll number '{student.roll}' already exists")
-            
-            # Check for duplicate email (excluding current student)
-            cursor.execute('SELECT id FROM students WHERE email = ? AND id != ?', (student.email, student.id))
-            if cursor.fetchone():
-                raise Exception(f"Student with email '{student.email}' already exists")
-            
-            cursor.execute('''
-                UPDATE students 
-                SET name = ?, roll = ?, department = ?, email = ?, phone = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (student.name, student.roll, student.department, student.email, student.phone, student.id))
-            
-            conn.commit()
-            return cursor.rowcount > 0
-            
+        except sqlite3.IntegrityError as e:
+            raise self._duplicate_student_error(str(e), student)
         except sqlite3.Error as e:
             raise Exception(f"Failed to update student: {str(e)}")
-        finally:
-            self.disconnect()
     
     def delete_student(self, student_id: int) -> bool:
         """
@@ -237,47 +847,81 @@ class Database:
             True if deletion was successful
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM students WHERE id = ?', (student_id,))
-            conn.commit()
+            with self._write_lock, self.connect():
+                cursor = self._exec(SQL_DELETE_STUDENT, (student_id,))
+            self._students_changed(cursor.rowcount)
             
             return cursor.rowcount > 0
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to delete student: {str(e)}")
-        finally:
-            self.disconnect()
+    
+    def delete_students(self, student_ids: List[int]) -> int:
+        """
+        Delete several students in one statement and transaction.
+        
+        Like get_students(), the IDs are bound as a single JSON array so the
+        statement is the same for any number of IDs.
+        
+        Args:
+            student_ids: IDs of the students to delete
+            
+        Returns:
+            Number of students deleted
+        """
+        if not student_ids:
+            return 0
+        
+        try:
+            with self._write_lock, self.connect():
+                cursor = self._exec(SQL_DELETE_STUDENTS, (json.dumps(list(student_ids)),))
+            self._students_changed(cursor.rowcount)
+            
+            return cursor.rowcount
+            
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to delete students: {str(e)}")
     
     def search_students(self, query: str) -> List[Student]:
         """
         Search students by name, roll, department, or email.
         
+        A query that exactly matches a roll number or email address returns
+        just that student via an index lookup; otherwise a substring search
+        is run across all four fields.
+        
         Args:
             query: Search query string
             
         Returns:
             List of matching Student objects
         """
+        key = exact_lookup_key(query)
+        if key is not None:
+            field, value = key
+            if field == 'roll':
+                student = self.get_student_by_roll(value)
+            else:
+                student = self.get_student_by_email(value)
+            if student:
+                return [student]
+        
+        if len(query) >= FTS_MIN_QUERY_LENGTH:
+            # Quote the query as a single FTS5 phrase (substring match)
+            phrase = '"' + query.replace('"', '""') + '"'
+            try:
+                rows = self._fetchall(SQL_SEARCH_STUDENTS_FTS, (phrase,))
+                return [Student._from_row(row) for row in rows]
+            except sqlite3.OperationalError:
+                pass  # No full-text index in this database, use the LIKE scan
+        
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            rows = self._fetchall(SQL_SEARCH_STUDENTS, {'pattern': like_pattern(query)})
             
-            search_pattern = f"%{query}%"
-            cursor.execute('''
-                SELECT * FROM students 
-                WHERE name LIKE ? OR roll LIKE ? OR department LIKE ? OR email LIKE ?
-                ORDER BY name
-            ''', (search_pattern, search_pattern, search_pattern, search_pattern))
-            
-            rows = cursor.fetchall()
-            return [Student.from_dict(dict(row)) for row in rows]
+            return [Student._from_row(row) for row in rows]
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to search students: {str(e)}")
-        finally:
-            self.disconnect()
     
     def get_students_by_department(self, department: str) -> List[Student]:
         """
@@ -290,39 +934,36 @@ class Database:
             List of Student objects from the department
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            rows = self._fetchall(SQL_STUDENTS_BY_DEPARTMENT, (department,))
             
-            cursor.execute('SELECT * FROM students WHERE department = ? ORDER BY name', (department,))
-            rows = cursor.fetchall()
-            
-            return [Student.from_dict(dict(row)) for row in rows]
+            return [Student._from_row(row) for row in rows]
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get students by department: {str(e)}")
-        finally:
-            self.disconnect()
     
     def get_departments(self) -> List[str]:
         """
         Get list of all departments.
         
+        The result is cached until students are written through this object
+        or PRAGMA data_version reports a commit from another connection.
+        
         Returns:
             List of unique department names
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            key = self._cache_key()
+            if self._departments_cache is not None and self._departments_cache_key == key:
+                return list(self._departments_cache)
             
-            cursor.execute('SELECT DISTINCT department FROM students ORDER BY department')
-            rows = cursor.fetchall()
+            departments = [row[0] for row in self._fetchall(SQL_DEPARTMENTS)]
+            self._departments_cache = departments
+            self._departments_cache_key = key
             
-            return [row[0] for row in rows]
+            return list(departments)
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get departments: {str(e)}")
-        finally:
-            self.disconnect()
     
     def get_student_count_by_department(self) -> Dict[str, int]:
         """
@@ -332,23 +973,12 @@ class Database:
             Dictionary with department names as keys and counts as values
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT department, COUNT(*) as count 
-                FROM students 
-                GROUP BY department 
-                ORDER BY department
-            ''')
-            rows = cursor.fetchall()
-            
-            return {row[0]: row[1] for row in rows}
+            # Each (department, count) row unpacks straight into the dict
+            with self._read_conn() as conn:
+                return dict(conn.execute(SQL_COUNT_BY_DEPARTMENT))
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get student count by department: {str(e)}")
-        finally:
-            self.disconnect()
     
     # User Authentication Operations
     
@@ -364,16 +994,67 @@ class Database:
             True if authentication successful
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT id FROM users WHERE username = ? AND password = ?', (username, password))
-            return cursor.fetchone() is not None
+            row = self._fetchone(SQL_PASSWORD_HASH_BY_USERNAME, (username,))
+            return row is not None and verify_password(password, row[0])
             
         except sqlite3.Error as e:
             raise Exception(f"Authentication failed: {str(e)}")
-        finally:
-            self.disconnect()
+    
+    def create_session(self, username: str, lifetime: int = SESSION_LIFETIME) -> Dict[str, Any]:
+        """
+        Create a signed session for a user who has just authenticated.
+        
+        Args:
+            username: Username
+            lifetime: Seconds until the session expires
+            
+        Returns:
+            Dictionary with 'user', 'expires' and 'sig' keys
+            
+        Raises:
+            Exception: If the user does not exist
+        """
+        try:
+            row = self._fetchone(SQL_PASSWORD_HASH_BY_USERNAME, (username,))
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to create session: {str(e)}")
+        
+        if row is None:
+            raise Exception("Failed to create session: user not found")
+        
+        expires = int(time.time()) + lifetime
+        return {
+            'user': username,
+            'expires': expires,
+            'sig': _session_signature(row[0], username, expires)
+        }
+    
+    def verify_session(self, session: Dict[str, Any]) -> bool:
+        """
+        Check a session produced by create_session().
+        
+        Args:
+            session: Session dictionary
+            
+        Returns:
+            True if the session is unexpired, correctly signed and its user exists
+        """
+        username = session.get('user')
+        expires = session.get('expires')
+        signature = session.get('sig')
+        if not isinstance(username, str) or not isinstance(expires, int) or not isinstance(signature, str):
+            return False
+        if expires <= time.time():
+            return False
+        
+        try:
+            row = self._fetchone(SQL_PASSWORD_HASH_BY_USERNAME, (username,))
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to verify session: {str(e)}")
+        
+        return row is not None and hmac.compare_digest(
+            signature, _session_signature(row[0], username, expires)
+        )
     
     def add_user(self, user: User) -> int:
         """
@@ -386,22 +1067,14 @@ class Database:
             ID of the inserted user
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
+            password_hash = hash_password(user.password)
+            with self._write_lock, self.connect():
+                cursor = self._exec(SQL_INSERT_USER, (user.username, password_hash))
             
-            cursor.execute('''
-                INSERT INTO users (username, password)
-                VALUES (?, ?)
-            ''', (user.username, user.password))
-            
-            user_id = cursor.lastrowid
-            conn.commit()
-            return user_id
+            return cursor.lastrowid
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to add user: {str(e)}")
-        finally:
-            self.disconnect()
     
     def get_user_count(self) -> int:
         """
@@ -411,13 +1084,30 @@ class Database:
             Number of users in the database
         """
         try:
-            conn = self.connect()
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT COUNT(*) FROM users')
-            return cursor.fetchone()[0]
+            return self._fetchone(SQL_USER_COUNT)[0]
             
         except sqlite3.Error as e:
             raise Exception(f"Failed to get user count: {str(e)}")
-        finally:
-            self.disconnect()
+
+
+# Shared Database instances, one per database file
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = "students.db") -> Database:
+    """
+    Get the shared Database for a database file, creating it on first use.
+    
+    Args:
+        db_path: Path to SQLite database file
+        
+    Returns:
+        The Database instance shared by every caller using this file
+    """
+    key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = Database(db_path)
+        return database
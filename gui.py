@@ -5,31 +5,50 @@ Main Tkinter GUI application with login, dashboard, and student management featu
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple, Set
+import queue
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 from models import Student
-from db import Database
-from utils import CSVHandler, ReportGenerator, ValidationHelper
+from db import Database, exact_lookup_key
+from session import SessionStore
+# utils (CSV import/export, reports) is imported inside the handlers that use
+# it, so it isn't loaded before the first window is shown
+
+# Virtual event a worker thread raises on the root window when a background
+# call has finished (used when Tcl is built with thread support)
+FUTURE_DONE_EVENT = "<<BackgroundCallDone>>"
+# Otherwise, how often (ms) the Tk thread checks whether a call finished
+FUTURE_POLL_MS = 20
+# Quiet period (ms) after the last keystroke before a search is run
+SEARCH_DEBOUNCE_MS = 200
+# Students fetched per query while loading the full list
+LOAD_PAGE_SIZE = 5000
+# Rows kept in the table at once; the rest are swapped in while scrolling
+TREE_WINDOW_SIZE = 500
+# Rows swapped in (and out at the other end) when the view nears a window edge
+TREE_PAGE_SIZE = 100
 
 class LoginWindow:
     """
     Login window for user authentication.
     """
     
-    def __init__(self, parent, on_login_success):
+    def __init__(self, parent, on_login_success, db: Database):
         """
         Initialize login window.
         
         Args:
             parent: Parent window
             on_login_success: Callback function when login is successful
+            db: Database instance, shared with the main application
         """
         self.parent = parent
         self.on_login_success = on_login_success
         self.window = None
-        self.db = Database()
+        self.db = db
         
     def show(self):
         """Show the login window"""
@@ -37,8 +56,13 @@ class LoginWindow:
         self.window.title("Student Management System - Login")
         self.window.geometry("400x300")
         self.window.resizable(False, False)
-        self.window.transient(self.parent)
+        # A transient window follows its master's state, so it would stay
+        # hidden along with a withdrawn root at startup
+        if self.parent.winfo_viewable():
+            self.window.transient(self.parent)
         self.window.grab_set()
+        # Closing the dialog quits like the Cancel button
+        self.window.protocol("WM_DELETE_WINDOW", self._cancel)
         
         # Center the window
         self.window.update_idletasks()
@@ -111,6 +135,10 @@ class LoginWindow:
         
         try:
             if self.db.authenticate_user(username, password):
+                try:
+                    SessionStore.save(self.db.create_session(username))
+                except Exception:
+                    pass  # Not remembered; the user just logs in again next launch
                 self.window.destroy()
                 self.on_login_success()
             else:
@@ -127,6 +155,9 @@ class LoginWindow:
 class StudentForm:
     """
     Student form dialog for adding/editing students.
+    
+    The window is built on the first show() and hidden rather than destroyed
+    when closed, so it can be reused via reset() for the next add or edit.
     """
     
     def __init__(self, parent, student: Optional[Student] = None, on_save=None):
@@ -143,15 +174,42 @@ class StudentForm:
         self.on_save = on_save
         self.window = None
         self.is_edit = student is not None
+    
+    def reset(self, student: Optional[Student] = None, on_save=None) -> 'StudentForm':
+        """
+        Point the form at another student (or a blank new one).
+        
+        Args:
+            student: Student object to edit (None for new student)
+            on_save: Callback function when form is saved
+            
+        Returns:
+            The form, so calls can be chained with show()
+        """
+        self.student = student
+        self.on_save = on_save
+        self.is_edit = student is not None
+        if self.window is not None and self.window.winfo_exists():
+            self._populate_fields()
+        return self
         
     def show(self):
         """Show the student form"""
+        if self.window is not None and self.window.winfo_exists():
+            self.window.title(f"{'Edit' if self.is_edit else 'Add'} Student")
+            self.window.deiconify()
+            self.window.lift()
+            self.window.grab_set()
+            self.name_entry.focus()
+            return
+        
         self.window = tk.Toplevel(self.parent)
         self.window.title(f"{'Edit' if self.is_edit else 'Add'} Student")
         self.window.geometry("500x400")
         self.window.resizable(False, False)
         self.window.transient(self.parent)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self._cancel)
         
         # Center the window
         self.window.update_idletasks()
@@ -179,16 +237,11 @@ class StudentForm:
         self.phone_var = tk.StringVar()
         
         # Populate fields if editing
-        if self.is_edit:
-            self.name_var.set(self.student.name)
-            self.roll_var.set(self.student.roll)
-            self.department_var.set(self.student.department)
-            self.email_var.set(self.student.email)
-            self.phone_var.set(self.student.phone)
+        self._populate_fields()
         
         # Name
         ttk.Label(form_frame, text="Name *:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        name_entry = ttk.Entry(form_frame, textvariable=self.name_var, width=30)
+        self.name_entry = name_entry = ttk.Entry(form_frame, textvariable=self.name_var, width=30)
         name_entry.grid(row=0, column=1, pady=5, padx=(10, 0), sticky=tk.W)
         
         # Roll Number
@@ -230,6 +283,19 @@ class StudentForm:
         
         # Focus on first entry
         name_entry.focus()
+    
+    def _populate_fields(self):
+        """Fill the fields from the student being edited, or clear them"""
+        if self.is_edit:
+            self.name_var.set(self.student.name)
+            self.roll_var.set(self.student.roll)
+            self.department_var.set(self.student.department)
+            self.email_var.set(self.student.email)
+            self.phone_var.set(self.student.phone)
+        else:
+            for var in (self.name_var, self.roll_var, self.department_var,
+                        self.email_var, self.phone_var):
+                var.set("")
         
     def _save(self):
         """Handle save button click"""
@@ -265,7 +331,7 @@ class StudentForm:
             if self.on_save:
                 self.on_save(student)
             
-            self.window.destroy()
+            self._close()
             
         except ValueError as e:
             messagebox.showerror("Validation Error", str(e))
@@ -274,7 +340,12 @@ class StudentForm:
     
     def _cancel(self):
         """Handle cancel button click"""
-        self.window.destroy()
+        self._close()
+    
+    def _close(self):
+        """Hide the form, keeping its widgets for the next add or edit"""
+        self.window.grab_release()
+        self.window.withdraw()
 
 
 class StudentManagementApp:
@@ -294,6 +365,40 @@ class StudentManagementApp:
         self.db = db
         self.current_students = []
         self.selected_student = None
+        self._students_by_id: Dict[int, Student] = {}
+        # Add/edit dialog, built on first use and reused afterwards
+        self._student_form: Optional[StudentForm] = None
+        # Treeview item id of each displayed student, for in-place row updates
+        self._iid_by_student_id: Dict[int, str] = {}
+        # Students the table is showing (current_students or search results);
+        # only _view_students[_window_start:_window_end] are in the widget
+        self._view_students: List[Student] = []
+        self._window_start = 0
+        self._window_end = 0
+        self._window_shift_pending = False
+        # True once current_students holds every student, so searches can be
+        # answered from memory; the lowercase haystacks and the roll/email
+        # lookup (keyed like exact_lookup_key) are built lazily
+        self._students_loaded = False
+        self._search_index: Optional[Tuple[List[Tuple[Student, str]], Dict[Tuple[str, str], Student]]] = None
+        
+        # Blocking database calls run here so the Tk event loop keeps pumping
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="db-io")
+        # Finished calls waiting to be dispatched on the Tk thread. With a
+        # threaded Tcl the workers wake the event loop directly, so nothing
+        # polls while the app is idle.
+        self._finished = queue.SimpleQueue()
+        self._wake_from_workers = self.root.tk.eval('info exists tcl_platform(threaded)') == '1'
+        self._closing = False
+        self.root.bind(FUTURE_DONE_EVENT, self._dispatch_finished)
+        # Bumped for every load/search so results of superseded requests are
+        # dropped from the table
+        self._view_request = 0
+        # Bumped for every load, so only the newest load keeps fetching pages;
+        # a search replaces what is shown but lets the load run on
+        self._load_request = 0
+        # Pending debounced search (Tk after id)
+        self._search_after_id = None
         
         # Configure root window
         self.root.title("Student Management System")
@@ -320,6 +425,7 @@ class StudentManagementApp:
         file_menu.add_command(label="Export to CSV...", command=self._export_csv)
         file_menu.add_command(label="Import from CSV...", command=self._import_csv)
         file_menu.add_separator()
+        file_menu.add_command(label="Sign out", command=self._sign_out)
         file_menu.add_command(label="Exit", command=self.root.quit)
         
         # Reports menu
@@ -377,7 +483,8 @@ class StudentManagementApp:
         
         # Create Treeview
         columns = ('ID', 'Name', 'Roll', 'Department', 'Email', 'Phone')
-        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15,
+                                 selectmode='extended')
         
         # Configure columns
         self.tree.heading('ID', text='ID')
@@ -396,9 +503,10 @@ class StudentManagementApp:
         self.tree.column('Phone', width=120, minwidth=100)
         
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
         h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self._v_scrollbar = v_scrollbar
+        self.tree.configure(yscrollcommand=self._on_tree_scroll, xscrollcommand=h_scrollbar.set)
         
         # Pack treeview and scrollbars
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -416,35 +524,400 @@ class StudentManagementApp:
                               relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, pady=(10, 0))
     
+    def close(self):
+        """Wait for background database work to finish (call before closing the database)"""
+        self._closing = True
+        self._io_pool.shutdown(wait=True)
+    
+    def _run_in_background(self, func: Callable, *args,
+                           on_success: Optional[Callable] = None,
+                           on_error: Optional[Callable] = None):
+        """
+        Run a blocking call on the I/O thread pool.
+        
+        The callbacks are invoked on the Tk main thread, so they may touch widgets.
+        
+        Args:
+            func: Function to run in the background
+            *args: Arguments for func
+            on_success: Called with func's return value
+            on_error: Called with the exception if func raised
+        """
+        future = self._io_pool.submit(func, *args)
+        if self._wake_from_workers:
+            future.add_done_callback(
+                lambda done: self._on_future_done(done, on_success, on_error)
+            )
+        else:
+            self.root.after(FUTURE_POLL_MS, self._poll_future, future, on_success, on_error)
+    
+    def _on_future_done(self, future: Future, on_success: Optional[Callable], on_error: Optional[Callable]):
+        """Queue a finished call and wake the Tk thread (runs on the worker thread)"""
+        self._finished.put((future, on_success, on_error))
+        if self._closing:
+            return
+        try:
+            # tkinter hands this to the Tk thread, where it runs _dispatch_finished
+            self.root.event_generate(FUTURE_DONE_EVENT, when='tail')
+        except (RuntimeError, tk.TclError):
+            pass  # The event loop has stopped; nobody is waiting for the result
+    
+    def _dispatch_finished(self, event=None):
+        """Dispatch every queued finished call"""
+        while True:
+            try:
+                future, on_success, on_error = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            self._dispatch_result(future, on_success, on_error)
+    
+    def _poll_future(self, future: Future, on_success: Optional[Callable], on_error: Optional[Callable]):
+        """Dispatch a finished background call's result, or check again later"""
+        if not future.done():
+            self.root.after(FUTURE_POLL_MS, self._poll_future, future, on_success, on_error)
+            return
+        
+        self._dispatch_result(future, on_success, on_error)
+    
+    def _dispatch_result(self, future: Future, on_success: Optional[Callable], on_error: Optional[Callable]):
+        """Pass a finished call's result or exception to its callback"""
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return
+        
+        if on_success:
+            on_success(result)
+    
+    def _new_view_request(self) -> int:
+        """Start a new load/search request, superseding any still in flight"""
+        self._view_request += 1
+        return self._view_request
+    
     def _load_students(self):
         """Load students from database and refresh the table"""
+        self.status_var.set("Loading students...")
+        
+        view_request = self._new_view_request()
+        self._load_request += 1
+        self._load_next_page(self._load_request, view_request, [])
+    
+    def _load_next_page(self, load_request: int, view_request: int, students: List[Student]):
+        """
+        Fetch the page of students following those loaded so far.
+        
+        Args:
+            load_request: Load the page belongs to
+            view_request: View request that started the load
+            students: Students loaded so far by this load
+        """
+        after = students[-1] if students else None
+        self._run_in_background(
+            self.db.get_students_page, LOAD_PAGE_SIZE, after,
+            on_success=lambda page: self._on_students_page(load_request, view_request, students, page),
+            on_error=lambda e: self._on_students_load_failed(load_request, e)
+        )
+    
+    def _on_students_page(self, load_request: int, view_request: int,
+                          students: List[Student], page: List[Student]):
+        """Append a page fetched by _load_students, then fetch the next one"""
+        if load_request != self._load_request:
+            return
+        
+        if students is not self.current_students:
+            # First page: current_students switches over to the new list now,
+            # and so does the table unless a search has replaced it meanwhile
+            self.current_students = students
+            self._students_by_id = {}
+            self._students_loaded = False
+            if view_request == self._view_request:
+                self._populate_tree(students)
+        
+        for student in page:
+            # A student saved while loading may already have been placed
+            if student.id not in self._students_by_id:
+                self.current_students.append(student)
+                self._students_by_id[student.id] = student
+        self._search_index = None
+        showing_all = self._showing_all_students()
+        if showing_all:
+            self._fill_window()
+        
+        if len(page) == LOAD_PAGE_SIZE:
+            if showing_all:
+                self.status_var.set(f"Loading students... ({len(self.current_students)})")
+            self._load_next_page(load_request, view_request, students)
+            return
+        
+        self._students_loaded = True
+        if showing_all:
+            self.status_var.set(f"Loaded {len(self.current_students)} students")
+    
+    def _on_students_load_failed(self, load_request: int, error: Exception):
+        """Report a failed _load_students"""
+        if load_request != self._load_request:
+            return
+        
+        messagebox.showerror("Error", f"Failed to load students: {str(error)}")
+        self.status_var.set("Error loading students")
+    
+    def _populate_tree(self, students: List[Student]):
+        """Replace the table contents with the given students"""
+        self._view_students = students
+        self._move_window(0)
+    
+    def _fill_window(self):
+        """Add rows at the end of the table until the window is full"""
+        if self._window_end - self._window_start >= TREE_WINDOW_SIZE:
+            return
+        end = min(len(self._view_students), self._window_start + TREE_WINDOW_SIZE)
+        self._insert_rows(self._window_end, end, 'end')
+        self._window_end = end
+    
+    def _insert_rows(self, start: int, end: int, position):
+        """
+        Insert _view_students[start:end] into the table.
+        
+        Args:
+            start: First index in _view_students
+            end: Index after the last one
+            position: Table index of the first new row, or 'end'
+        """
+        # Hide the columns while filling so Tk doesn't re-lay out the table per row
+        displaycolumns = self.tree['displaycolumns']
+        self.tree.configure(displaycolumns=())
         try:
-            self.status_var.set("Loading students...")
-            self.root.update()
-            
-            # Get students from database
-            self.current_students = self.db.get_all_students()
-            
-            # Clear existing items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Add students to treeview
-            for student in self.current_students:
-                self.tree.insert('', tk.END, values=(
-                    student.id,
-                    student.name,
-                    student.roll,
-                    student.department,
-                    student.email,
-                    student.phone
-                ))
+            insert = self.tree.insert
+            iid_by_student_id = self._iid_by_student_id
+            for offset, student in enumerate(self._view_students[start:end]):
+                index = position if position == 'end' else position + offset
+                iid_by_student_id[student.id] = insert('', index, values=self._row_values(student))
+        finally:
+            self.tree.configure(displaycolumns=displaycolumns)
+    
+    def _on_tree_scroll(self, first, last):
+        """Update the scrollbar and slide the row window near either end"""
+        # The tree reports fractions of the rows in the window; the scrollbar
+        # shows the position within all of _view_students
+        total = len(self._view_students)
+        size = self._window_end - self._window_start
+        if total and size:
+            self._v_scrollbar.set((self._window_start + float(first) * size) / total,
+                                  (self._window_start + float(last) * size) / total)
+        else:
+            self._v_scrollbar.set(first, last)
+        if self._window_shift_pending:
+            return
+        
+        if float(last) > 0.9 and self._window_end < len(self._view_students):
+            self._window_shift_pending = True
+            self.root.after_idle(self._shift_window, True)
+        elif float(first) < 0.1 and self._window_start > 0:
+            self._window_shift_pending = True
+            self.root.after_idle(self._shift_window, False)
+    
+    def _on_scrollbar(self, *args):
+        """
+        Handle a scrollbar command on the table.
+        
+        Arrow and trough clicks ('scroll') scroll the tree, which slides the
+        window as its edges come into view. A drag ('moveto') positions the
+        view within all of _view_students, moving the window there first if
+        the target rows are not in it.
+        """
+        if args[0] != 'moveto':
+            self.tree.yview(*args)
+            return
+        
+        total = len(self._view_students)
+        if not total:
+            return
+        first, last = self.tree.yview()
+        size = self._window_end - self._window_start
+        visible = max(1, round((float(last) - float(first)) * size))
+        top = min(max(0, round(float(args[1]) * total)), max(0, total - visible))
+        
+        if not (self._window_start <= top and top + visible <= self._window_end):
+            self._move_window(min(max(0, top - TREE_WINDOW_SIZE // 2), max(0, total - TREE_WINDOW_SIZE)))
+        size = self._window_end - self._window_start
+        if size:
+            self.tree.yview_moveto((top - self._window_start) / size)
+    
+    def _move_window(self, start: int):
+        """Replace the table rows with the window starting at _view_students[start]"""
+        # Clear existing items in a single call
+        self.tree.delete(*self.tree.get_children())
+        self._iid_by_student_id = {}
+        self._window_start = self._window_end = start
+        self._fill_window()
+    
+    def _shift_window(self, forward: bool):
+        """
+        Move the row window TREE_PAGE_SIZE rows towards the end or start.
+        
+        Rows are added on one side and trimmed on the other, and the view
+        is re-positioned so the visible rows stay where they were.
+        
+        Args:
+            forward: True to move towards the end of _view_students
+        """
+        self._window_shift_pending = False
+        children = self.tree.get_children()
+        top = round(self.tree.yview()[0] * len(children))
+        
+        if forward:
+            added = min(TREE_PAGE_SIZE, len(self._view_students) - self._window_end)
+            self._insert_rows(self._window_end, self._window_end + added, 'end')
+            self._window_end += added
+            trimmed = max(0, self._window_end - self._window_start - TREE_WINDOW_SIZE)
+            self._drop_rows(self._window_start, self._window_start + trimmed)
+            self._window_start += trimmed
+            top -= trimmed
+        else:
+            added = min(TREE_PAGE_SIZE, self._window_start)
+            self._insert_rows(self._window_start - added, self._window_start, 0)
+            self._window_start -= added
+            trimmed = max(0, self._window_end - self._window_start - TREE_WINDOW_SIZE)
+            self._drop_rows(self._window_end - trimmed, self._window_end)
+            self._window_end -= trimmed
+            top += added
+        
+        size = self._window_end - self._window_start
+        if size:
+            self.tree.yview_moveto(max(0, top) / size)
+    
+    def _drop_rows(self, start: int, end: int):
+        """Delete the rows of _view_students[start:end] from the table"""
+        iids = [self._iid_by_student_id.pop(s.id) for s in self._view_students[start:end]]
+        if iids:
+            self.tree.delete(*iids)
+    
+    def _view_inserted(self, index: int):
+        """Show the student just inserted at _view_students[index] if it is in the window"""
+        if index < self._window_start:
+            self._window_start += 1
+            self._window_end += 1
+        elif index <= self._window_end:
+            student = self._view_students[index]
+            self._iid_by_student_id[student.id] = self.tree.insert(
+                '', index - self._window_start, values=self._row_values(student)
+            )
+            self._window_end += 1
+    
+    def _remove_from_view(self, student_ids: Set[int]):
+        """Remove students from _view_students and delete any of their rows, in one pass"""
+        kept = []
+        removed_before = removed_within = 0
+        iids = []
+        for index, student in enumerate(self._view_students):
+            if student.id not in student_ids:
+                kept.append(student)
+            elif index < self._window_start:
+                removed_before += 1
+            elif index < self._window_end:
+                removed_within += 1
+                iids.append(self._iid_by_student_id.pop(student.id))
+        
+        if len(kept) == len(self._view_students):
+            return
+        # Updated in place: _view_students may be current_students itself
+        self._view_students[:] = kept
+        if iids:
+            self.tree.delete(*iids)
+        self._window_start -= removed_before
+        self._window_end -= removed_before + removed_within
+    
+    @staticmethod
+    def _row_values(student: Student) -> Tuple:
+        """Column values shown in the table for a student"""
+        return (
+            student.id,
+            student.name,
+            student.roll,
+            student.department,
+            student.email,
+            student.phone
+        )
+    
+    def _place_student(self, student: Student) -> Optional[int]:
+        """
+        Insert a student into current_students, keeping it ordered by (name, id).
+        
+        Args:
+            student: Student to insert
             
+        Returns:
+            Index the student was inserted at, or None if it sorts after the
+            students loaded so far (a later page will bring it in)
+        """
+        if not self._students_loaded and (
+                not self.current_students
+                or (student.name, student.id) > (self.current_students[-1].name, self.current_students[-1].id)):
+            return None
+        
+        # Binary search on (name, id) without building a key list
+        students = self.current_students
+        key = (student.name, student.id)
+        index, high = 0, len(students)
+        while index < high:
+            middle = (index + high) // 2
+            if key < (students[middle].name, students[middle].id):
+                high = middle
+            else:
+                index = middle + 1
+        students.insert(index, student)
+        self._students_by_id[student.id] = student
+        self._search_index = None
+        return index
+    
+    def _forget_students(self, student_ids: Set[int]):
+        """Remove students from current_students, if present"""
+        known = [student_id for student_id in student_ids
+                 if self._students_by_id.pop(student_id, None) is not None]
+        if not known:
+            return
+        self._search_index = None
+        self.current_students[:] = [s for s in self.current_students if s.id not in student_ids]
+    
+    def _showing_all_students(self) -> bool:
+        """Whether the table is showing current_students rather than search results"""
+        return self._view_students is self.current_students
+    
+    def _show_added_student(self, student: Student):
+        """Add a newly saved student to the table without reloading it"""
+        index = self._place_student(student)
+        if not self._showing_all_students():
+            # The table shows search results; re-run the search so the
+            # new student only appears if it matches
+            self._run_search()
+            return
+        
+        if index is not None:
+            self._view_inserted(index)
+        if self._students_loaded:
             self.status_var.set(f"Loaded {len(self.current_students)} students")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load students: {str(e)}")
-            self.status_var.set("Error loading students")
+    
+    def _show_updated_student(self, student: Student):
+        """Refresh an edited student's row without reloading the table"""
+        if self.selected_student and self.selected_student.id == student.id:
+            self.selected_student = student
+        if not self._showing_all_students():
+            self._forget_students({student.id})
+            self._place_student(student)
+            self._run_search()
+            return
+        
+        was_selected = self._iid_by_student_id.get(student.id) in self.tree.selection()
+        self._remove_from_view({student.id})
+        self._forget_students({student.id})
+        index = self._place_student(student)
+        if index is not None:
+            self._view_inserted(index)
+        iid = self._iid_by_student_id.get(student.id)
+        if was_selected and iid is not None:
+            self.tree.selection_set(iid)
     
     def _on_student_select(self, event):
         """Handle student selection in treeview"""
@@ -452,16 +925,13 @@ class StudentManagementApp:
         if selection:
             item = self.tree.item(selection[0])
             student_id = item['values'][0]
-            self.selected_student = next(
-                (s for s in self.current_students if s.id == student_id), None
-            )
+            self.selected_student = self._students_by_id.get(student_id)
         else:
             self.selected_student = None
     
     def _add_student(self):
         """Show add student form"""
-        form = StudentForm(self.root, on_save=self._save_student)
-        form.show()
+        self._get_form().reset(on_save=self._save_student).show()
     
     def _edit_student(self):
         """Show edit student form"""
@@ -469,96 +939,188 @@ class StudentManagementApp:
             messagebox.showwarning("Warning", "Please select a student to edit")
             return
         
-        form = StudentForm(self.root, self.selected_student, on_save=self._save_student)
-        form.show()
+        self._get_form().reset(self.selected_student, on_save=self._save_student).show()
+    
+    def _get_form(self) -> StudentForm:
+        """Get the student form, creating it on first use"""
+        if self._student_form is None:
+            self._student_form = StudentForm(self.root)
+        return self._student_form
     
     def _save_student(self, student: Student):
         """Save student (add or update)"""
         try:
             if student.id is None:
                 # Add new student
-                student_id = self.db.add_student(student)
-                student = Student(student.name, student.roll, student.department, 
-                                student.email, student.phone, student_id)
+                student.id = self.db.add_student(student)
+                self._show_added_student(student)
                 messagebox.showinfo("Success", "Student added successfully")
             else:
                 # Update existing student
                 self.db.update_student(student)
+                self._show_updated_student(student)
                 messagebox.showinfo("Success", "Student updated successfully")
             
-            # Refresh the table
-            self._load_students()
-            
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save student: {str(e)}")
     
     def _delete_student(self):
-        """Delete selected student"""
-        if not self.selected_student:
+        """Delete the selected students"""
+        rows = [self.tree.item(iid)['values'] for iid in self.tree.selection()]
+        if not rows:
             messagebox.showwarning("Warning", "Please select a student to delete")
             return
+        student_ids = [row[0] for row in rows]
         
         # Confirm deletion
-        result = messagebox.askyesno("Confirm Delete", 
-                                   f"Are you sure you want to delete student '{self.selected_student.name}'?")
+        if len(rows) == 1:
+            message = f"Are you sure you want to delete student '{rows[0][1]}'?"
+        else:
+            message = f"Are you sure you want to delete {len(student_ids)} students?"
+        result = messagebox.askyesno("Confirm Delete", message)
         if result:
-            try:
-                self.db.delete_student(self.selected_student.id)
-                messagebox.showinfo("Success", "Student deleted successfully")
-                self._load_students()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete student: {str(e)}")
+            self._run_in_background(
+                self.db.delete_students, student_ids,
+                on_success=lambda deleted: self._on_students_deleted(set(student_ids)),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to delete student: {str(e)}")
+            )
+    
+    def _on_students_deleted(self, student_ids: Set[int]):
+        """Drop deleted students' rows from the table"""
+        self._remove_from_view(student_ids)
+        self._forget_students(student_ids)
+        self._fill_window()
+        if self._showing_all_students() and self._students_loaded:
+            self.status_var.set(f"Loaded {len(self.current_students)} students")
+        if self.selected_student and self.selected_student.id in student_ids:
+            self.selected_student = None
+        if len(student_ids) == 1:
+            messagebox.showinfo("Success", "Student deleted successfully")
+        else:
+            messagebox.showinfo("Success", f"{len(student_ids)} students deleted successfully")
     
     def _on_search(self, event):
-        """Handle search input"""
+        """Handle search input, waiting for typing to pause before searching"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._run_search)
+    
+    def _run_search(self):
+        """Search the database for the current query and show the results"""
+        self._search_after_id = None
         query = self.search_var.get().strip()
         if not query:
             self._load_students()
             return
         
-        try:
-            # Search students
-            search_results = self.db.search_students(query)
-            
-            # Clear existing items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Add search results to treeview
-            for student in search_results:
-                self.tree.insert('', tk.END, values=(
-                    student.id,
-                    student.name,
-                    student.roll,
-                    student.department,
-                    student.email,
-                    student.phone
-                ))
-            
-            self.status_var.set(f"Found {len(search_results)} students matching '{query}'")
+        if self._students_loaded:
+            # Every student is already in memory; filter there instead of querying
+            request = self._new_view_request()
+            self._on_search_results(request, query, self._filter_students(query))
+            return
+        
+        request = self._new_view_request()
+        self._run_in_background(
+            self.db.search_students, query,
+            on_success=lambda results: self._on_search_results(request, query, results),
+            on_error=lambda e: self._on_search_failed(request, e)
+        )
+    
+    def _filter_students(self, query: str) -> List[Student]:
+        """
+        Substring-match a query against the loaded students.
+        
+        Like Database.search_students, a query that exact_lookup_key
+        recognizes and that names a loaded student's roll number or email
+        returns just that student; otherwise name, roll, department and email
+        are matched case-insensitively.
+        
+        Args:
+            query: Search query
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
+        Returns:
+            Matching students, in current_students order
+        """
+        if self._search_index is None:
+            haystacks = [
+                (s, "\n".join((s.name, s.roll, s.department, s.email)).lower())
+                for s in self.current_students
+            ]
+            by_key = {('roll', s.roll): s for s in self.current_students}
+            by_key.update((('email', s.email), s) for s in self.current_students)
+            self._search_index = (haystacks, by_key)
+        haystacks, by_key = self._search_index
+        
+        key = exact_lookup_key(query)
+        if key is not None and key in by_key:
+            return [by_key[key]]
+        
+        needle = query.lower()
+        return [student for student, haystack in haystacks if needle in haystack]
+    
+    def _on_search_results(self, request: int, query: str, search_results: List[Student]):
+        """Show the results of a background search"""
+        if request != self._view_request:
+            return
+        
+        self._populate_tree(search_results)
+        self.status_var.set(f"Found {len(search_results)} students matching '{query}'")
+    
+    def _on_search_failed(self, request: int, error: Exception):
+        """Report a failed background search"""
+        if request != self._view_request:
+            return
+        
+        messagebox.showerror("Error", f"Search failed: {str(error)}")
     
     def _clear_search(self):
         """Clear search and reload all students"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
         self.search_var.set("")
         self._load_students()
     
+    def _sign_out(self):
+        """Forget the saved login session and close the application"""
+        if messagebox.askyesno("Sign out", "Sign out and close the application?"):
+            SessionStore.clear()
+            self.root.quit()
+    
     def _export_csv(self):
         """Export students to CSV"""
+        from utils import CSVHandler
+        
         if not self.current_students:
             messagebox.showwarning("Warning", "No students to export")
             return
         
-        try:
-            filename = CSVHandler.export_students_to_csv(self.current_students)
-            messagebox.showinfo("Success", f"Students exported to {filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Export failed: {str(e)}")
+        filename = CSVHandler.ask_export_filename()
+        if not filename:
+            return
+        
+        # Stream rows straight from the database to the file off the Tk thread
+        self.status_var.set("Exporting students...")
+        self._run_in_background(
+            lambda: CSVHandler.export_students_to_csv(self.db.iter_all_students(), filename),
+            on_success=self._on_export_complete,
+            on_error=self._on_export_failed
+        )
+    
+    def _on_export_complete(self, filename: str):
+        """Report a finished background export"""
+        self.status_var.set(f"Loaded {len(self.current_students)} students")
+        messagebox.showinfo("Success", f"Students exported to {filename}")
+    
+    def _on_export_failed(self, error: Exception):
+        """Report a failed background export"""
+        self.status_var.set("Export failed")
+        messagebox.showerror("Error", f"Export failed: {str(error)}")
     
     def _import_csv(self):
         """Import students from CSV"""
+        from utils import CSVHandler
+        
         try:
             # Import CSV data
             students_data = CSVHandler.import_students_from_csv()
@@ -568,7 +1130,7 @@ class StudentManagementApp:
                 return
             
             # Validate data
-            errors = CSVHandler.validate_csv_data(students_data)
+            errors, students = CSVHandler.validate_csv_data(students_data)
             if errors:
                 error_msg = "Validation errors found:\n\n" + "\n".join(errors[:10])
                 if len(errors) > 10:
@@ -578,38 +1140,60 @@ class StudentManagementApp:
             
             # Confirm import
             result = messagebox.askyesno("Confirm Import", 
-                                       f"Import {len(students_data)} students?")
+                                       f"Import {len(students)} students?")
             if result:
-                imported_count = 0
-                error_count = 0
-                
-                for student_data in students_data:
-                    try:
-                        student = Student(
-                            name=student_data['name'],
-                            roll=student_data['roll'],
-                            department=student_data['department'],
-                            email=student_data['email'],
-                            phone=student_data.get('phone', '')
-                        )
-                        self.db.add_student(student)
-                        imported_count += 1
-                    except Exception as e:
-                        error_count += 1
-                        print(f"Failed to import student {student_data.get('name', 'Unknown')}: {str(e)}")
-                
-                messagebox.showinfo("Import Complete", 
-                                  f"Imported {imported_count} students successfully.\n"
-                                  f"Failed to import {error_count} students.")
-                
-                # Refresh the table
-                self._load_students()
+                self.status_var.set(f"Importing {len(students)} students...")
+                self._run_in_background(
+                    self._add_students_batch, students,
+                    on_success=self._on_import_complete,
+                    on_error=lambda e: messagebox.showerror("Error", f"Import failed: {str(e)}")
+                )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Import failed: {str(e)}")
     
+    def _add_students_batch(self, students: List[Student]) -> Tuple[int, int]:
+        """
+        Insert students in one transaction, isolating rejected rows on failure
+        (runs on the I/O thread pool during a CSV import).
+        
+        A batch the database rejects (e.g. a duplicate roll) is split in half
+        and each half retried, so only the offending rows are dropped while
+        the rest still go in as large batches.
+        
+        Returns:
+            Tuple of (inserted count, failed count)
+        """
+        if not students:
+            return 0, 0
+        
+        try:
+            self.db.add_students(students)
+            return len(students), 0
+        except Exception as e:
+            if len(students) == 1:
+                print(f"Failed to import student {students[0].name}: {str(e)}")
+                return 0, 1
+        
+        middle = len(students) // 2
+        first_ok, first_failed = self._add_students_batch(students[:middle])
+        second_ok, second_failed = self._add_students_batch(students[middle:])
+        return first_ok + second_ok, first_failed + second_failed
+    
+    def _on_import_complete(self, counts: Tuple[int, int]):
+        """Report a finished background import and refresh the table"""
+        imported_count, error_count = counts
+        messagebox.showinfo("Import Complete", 
+                          f"Imported {imported_count} students successfully.\n"
+                          f"Failed to import {error_count} students.")
+        
+        # Refresh the table
+        self._load_students()
+    
     def _show_department_report(self):
         """Show department report"""
+        from utils import ReportGenerator
+        
         if not self.current_students:
             messagebox.showwarning("Warning", "No students to generate report")
             return
@@ -622,6 +1206,8 @@ class StudentManagementApp:
     
     def _show_summary_report(self):
         """Show summary report"""
+        from utils import ReportGenerator
+        
         if not self.current_students:
             messagebox.showwarning("Warning", "No students to generate report")
             return
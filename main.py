@@ -11,21 +11,40 @@ import os
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from gui import StudentManagementApp
-from db import Database
+from gui import LoginWindow, StudentManagementApp
+from db import get_database
+from session import SessionStore
 
 def main():
     """Main function to start the Student Management System"""
     try:
         # Initialize database
-        db = Database()
+        db = get_database()
         db.initialize_database()
         
         # Create and run the GUI application
         root = tk.Tk()
-        app = StudentManagementApp(root, db)
+        app = None
+        
+        def start_app():
+            nonlocal app
+            root.deiconify()
+            app = StudentManagementApp(root, db)
+        
+        # A valid saved session skips the login window
+        session = SessionStore.load()
+        if session is not None and db.verify_session(session):
+            start_app()
+        else:
+            # Keep the empty root window hidden until the login succeeds
+            root.withdraw()
+            LoginWindow(root, start_app, db).show()
         root.mainloop()
         
+        if app is not None:
+            app.close()
+        db.disconnect()
+        
     except Exception as e:
         messagebox.showerror("Error", f"Failed to start application: {str(e)}")
         sys.exit(1)
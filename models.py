@@ -3,15 +3,26 @@ Student Management System - Models
 Contains the Student class and related data models.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import re
+import string
+import sys
+
+# Deletes every character allowed in a roll number, so whatever is left is invalid
+_ROLL_DISALLOWED = str.maketrans('', '', string.ascii_uppercase + string.digits + '-_')
+
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^[\+]?[0-9\s\-\(\)]{7,15}$')
 
 class Student:
     """
     Student class representing a student with all their attributes.
-    Implements encapsulation and validation.
+    Fields are validated and normalized on construction and stored in slots.
     """
     
+    __slots__ = ('id', 'name', 'roll', 'department', 'email', 'phone')
+    
     def __init__(self, name: str, roll: str, department: str, email: str, phone: str = "", student_id: Optional[int] = None):
         """
         Initialize a Student object with validation.
@@ -24,94 +35,93 @@ class Student:
             phone: Student's phone number (optional)
             student_id: Database ID (None for new students)
         """
-        self._id = student_id
-        self._name = self._validate_name(name)
-        self._roll = self._validate_roll(roll)
-        self._department = self._validate_department(department)
-        self._email = self._validate_email(email)
-        self._phone = self._validate_phone(phone)
-    
-    @property
-    def id(self) -> Optional[int]:
-        """Get student ID"""
-        return self._id
-    
-    @property
-    def name(self) -> str:
-        """Get student name"""
-        return self._name
-    
-    @property
-    def roll(self) -> str:
-        """Get student roll number"""
-        return self._roll
-    
-    @property
-    def department(self) -> str:
-        """Get student department"""
-        return self._department
-    
-    @property
-    def email(self) -> str:
-        """Get student email"""
-        return self._email
-    
-    @property
-    def phone(self) -> str:
-        """Get student phone"""
-        return self._phone
-    
-    def _validate_name(self, name: str) -> str:
+        self.id = student_id
+        self.name = self._validate_name(name)
+        self.roll = self._validate_roll(roll)
+        self.department = self._validate_department(department)
+        self.email = self._validate_email(email)
+        self.phone = self._validate_phone(phone)
+    
+    @staticmethod
+    def _validate_name(name: str) -> str:
         """Validate and clean student name"""
-        if not name or not name.strip():
+        name = (name or "").strip()
+        if not name:
             raise ValueError("Name cannot be empty")
-        return name.strip().title()
+        return name.title()
     
-    def _validate_roll(self, roll: str) -> str:
+    @staticmethod
+    def _validate_roll(roll: str) -> str:
         """Validate roll number format"""
-        if not roll or not roll.strip():
+        roll = (roll or "").strip()
+        if not roll:
             raise ValueError("Roll number cannot be empty")
-        roll = roll.strip().upper()
-        if not re.match(r'^[A-Z0-9\-_]+$', roll):
+        roll = roll.upper()
+        if roll.translate(_ROLL_DISALLOWED):
             raise ValueError("Roll number can only contain letters, numbers, hyphens, and underscores")
         return roll
     
-    def _validate_department(self, department: str) -> str:
+    @staticmethod
+    def _validate_department(department: str) -> str:
         """Validate department name"""
-        if not department or not department.strip():
+        department = (department or "").strip()
+        if not department:
             raise ValueError("Department cannot be empty")
-        return department.strip().title()
+        # Departments repeat across many students; interning makes them share one string
+        return sys.intern(department.title())
     
-    def _validate_email(self, email: str) -> str:
+    @staticmethod
+    def _validate_email(email: str) -> str:
         """Validate email format"""
-        if not email or not email.strip():
+        email = (email or "").strip()
+        if not email:
             raise ValueError("Email cannot be empty")
-        email = email.strip().lower()
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        email = email.lower()
+        if not _EMAIL_RE.match(email):
             raise ValueError("Invalid email format")
         return email
     
-    def _validate_phone(self, phone: str) -> str:
+    @staticmethod
+    def _validate_phone(phone: str) -> str:
         """Validate phone number format"""
         if not phone:
             return ""
         phone = phone.strip()
         # Allow various phone formats
-        phone_pattern = r'^[\+]?[0-9\s\-\(\)]{7,15}$'
-        if not re.match(phone_pattern, phone):
+        if not _PHONE_RE.match(phone):
             raise ValueError("Invalid phone number format")
         return phone
     
+    @classmethod
+    def validate_fields_only(cls, data: Dict[str, Any]) -> List[str]:
+        """
+        Run the constructor's field checks without building a Student.
+        
+        Args:
+            data: Dictionary with name, roll, department, email and optional phone
+            
+        Returns:
+            Validation error messages, one per invalid field (empty if valid)
+        """
+        errors = []
+        for validate, key in ((cls._validate_name, 'name'), (cls._validate_roll, 'roll'),
+                              (cls._validate_department, 'department'),
+                              (cls._validate_email, 'email'), (cls._validate_phone, 'phone')):
+            try:
+                validate(data.get(key, ''))
+            except ValueError as e:
+                errors.append(str(e))
+        return errors
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert student object to dictionary for database operations"""
         return {
-            'id': self._id,
-            'name': self._name,
-            'roll': self._roll,
-            'department': self._department,
-            'email': self._email,
-            'phone': self._phone
+            'id': self.id,
+            'name': self.name,
+            'roll': self.roll,
+            'department': self.department,
+            'email': self.email,
+            'phone': self.phone
         }
     
     @classmethod
@@ -126,13 +136,27 @@ class Student:
             student_id=data['id']
         )
     
+    @classmethod
+    def _from_row(cls, row) -> 'Student':
+        """
+        Create Student object from a database row tuple (id, name, roll, department, email, phone).
+        
+        Rows were validated and normalized when they were written, so the
+        fields are assigned directly instead of going through __init__.
+        """
+        student = cls.__new__(cls)
+        student.id, student.name, student.roll, department, student.email, phone = row
+        student.department = sys.intern(department)
+        student.phone = phone or ''
+        return student
+    
     def __str__(self) -> str:
         """String representation of Student"""
-        return f"Student({self._roll}: {self._name}, {self._department})"
+        return f"Student({self.roll}: {self.name}, {self.department})"
     
     def __repr__(self) -> str:
         """Detailed string representation of Student"""
-        return f"Student(id={self._id}, name='{self._name}', roll='{self._roll}', department='{self._department}', email='{self._email}', phone='{self._phone}')"
+        return f"Student(id={self.id}, name='{self.name}', roll='{self.roll}', department='{self.department}', email='{self.email}', phone='{self.phone}')"
 
 
 class User:
@@ -0,0 +1,63 @@
+"""
+Student Management System - Login Session
+Remembers a signed login session between launches.
+"""
+
+import json
+import os
+from typing import Dict, Any, Optional
+
+class SessionStore:
+    """
+    Persists the signed login session between launches.
+    
+    Only the session dictionary from Database.create_session() is stored,
+    never the password.
+    """
+    
+    SESSION_FILE = os.path.join(os.path.expanduser("~"), ".sms", "session.json")
+    
+    @staticmethod
+    def load() -> Optional[Dict[str, Any]]:
+        """
+        Read the saved session.
+        
+        Returns:
+            Session dictionary, or None if there is no readable session
+        """
+        try:
+            with open(SessionStore.SESSION_FILE, 'r', encoding='utf-8') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return session if isinstance(session, dict) else None
+    
+    @staticmethod
+    def save(session: Dict[str, Any]):
+        """
+        Save a session, readable only by the current user.
+        
+        Args:
+            session: Session dictionary to save
+            
+        Raises:
+            Exception: If the session cannot be written
+        """
+        try:
+            directory = os.path.dirname(SessionStore.SESSION_FILE)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            temp_path = SessionStore.SESSION_FILE + '.tmp'
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(session, f)
+            os.replace(temp_path, SessionStore.SESSION_FILE)
+        except OSError as e:
+            raise Exception(f"Failed to save session: {str(e)}")
+    
+    @staticmethod
+    def clear():
+        """Delete the saved session, if any"""
+        try:
+            os.remove(SessionStore.SESSION_FILE)
+        except FileNotFoundError:
+            pass
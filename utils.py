@@ -4,23 +4,48 @@ Handles CSV import/export and other helper functions.
 """
 
 import csv
+import io
 import os
-from typing import List, Dict, Any, Optional
-from tkinter import filedialog, messagebox
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Tuple, AbstractSet
 from models import Student
 
+# Header row written by the CSV export
+_CSV_FIELDNAMES = ('ID', 'Name', 'Roll', 'Department', 'Email', 'Phone')
+
 class CSVHandler:
     """
     Handles CSV import and export operations for student data.
     """
     
     @staticmethod
-    def export_students_to_csv(students: List[Student], filename: Optional[str] = None) -> str:
+    def ask_export_filename() -> str:
+        """
+        Show the save dialog for a CSV export.
+        
+        Returns:
+            Chosen path, or an empty string if the dialog was cancelled
+        """
+        # Imported here so that loading utils does not initialize tkinter
+        from tkinter import filedialog
+        
+        return filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Export Students to CSV"
+        )
+    
+    @staticmethod
+    def export_students_to_csv(students: Iterable[Student], filename: Optional[str] = None) -> str:
         """
         Export students to CSV file.
         
+        Students are written as they are iterated, so a generator such as
+        Database.iter_all_students() is exported without being materialized.
+        
         Args:
-            students: List of Student objects to export
+            students: Student objects to export
             filename: Optional filename, if None will show save dialog
             
         Returns:
@@ -31,29 +56,20 @@ class CSVHandler:
         """
         try:
             if filename is None:
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".csv",
-                    filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                    title="Export Students to CSV"
-                )
+                filename = CSVHandler.ask_export_filename()
                 
                 if not filename:
                     raise Exception("No file selected for export")
             
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['ID', 'Name', 'Roll', 'Department', 'Email', 'Phone']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for student in students:
-                    writer.writerow({
-                        'ID': student.id,
-                        'Name': student.name,
-                        'Roll': student.roll,
-                        'Department': student.department,
-                        'Email': student.email,
-                        'Phone': student.phone
-                    })
+                writer.writerow(_CSV_FIELDNAMES)
+                writer.writerows(
+                    (student.id, student.name, student.roll, student.department,
+                     student.email, student.phone)
+                    for student in students
+                )
             
             return filename
             
@@ -76,6 +92,8 @@ class CSVHandler:
         """
         try:
             if filename is None:
+                from tkinter import filedialog
+                
                 filename = filedialog.askopenfilename(
                     filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
                     title="Import Students from CSV"
@@ -89,11 +107,11 @@ class CSVHandler:
             
             students_data = []
             with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
-                # Try to detect delimiter
-                sample = csvfile.read(1024)
+                # Detect the delimiter from the header line: the most frequent
+                # of the usual candidates, defaulting to a comma
+                header = csvfile.readline()
                 csvfile.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
+                delimiter = max(',;\t|', key=header.count)
                 
                 reader = csv.DictReader(csvfile, delimiter=delimiter)
                 
@@ -135,47 +153,67 @@ class CSVHandler:
             raise Exception(f"Failed to import CSV: {str(e)}")
     
     @staticmethod
-    def validate_csv_data(students_data: List[Dict[str, Any]]) -> List[str]:
+    def validate_csv_data(students_data: List[Dict[str, Any]]) -> Tuple[List[str], List[Student]]:
         """
-        Validate imported CSV data and return list of validation errors.
+        Validate imported CSV data.
         
         Args:
             students_data: List of student data dictionaries
             
         Returns:
-            List of validation error messages
+            Tuple of (validation error messages, Student objects built from
+            the rows whose fields are valid), so the import can insert them
+            without constructing and validating each row a second time
         """
-        errors = []
-        seen_rolls = set()
-        seen_emails = set()
-        
-        for i, student_data in enumerate(students_data, start=1):
+        # Build a Student per row; only rows that fail are re-checked field by
+        # field so that every invalid field gets reported
+        students = []
+        checked = []
+        for student_data in students_data:
             try:
-                # Create temporary Student object to validate
                 student = Student(
-                    name=student_data['name'],
-                    roll=student_data['roll'],
-                    department=student_data['department'],
-                    email=student_data['email'],
+                    name=student_data.get('name', ''),
+                    roll=student_data.get('roll', ''),
+                    department=student_data.get('department', ''),
+                    email=student_data.get('email', ''),
                     phone=student_data.get('phone', '')
                 )
-                
-                # Check for duplicate roll numbers in the import data
-                if student.roll in seen_rolls:
-                    errors.append(f"Row {i}: Duplicate roll number '{student.roll}' in import data")
+            except ValueError:
+                checked.append((Student.validate_fields_only(student_data), None, None))
+                continue
+            students.append(student)
+            checked.append((None, student.roll, student.email))
+        
+        # Count rolls and emails in one C-level pass each; only values seen
+        # more than once need tracking below
+        roll_counts = Counter(roll for _, roll, _ in checked if roll is not None)
+        email_counts = Counter(email for _, _, email in checked if email is not None)
+        duplicate_rolls = {roll for roll, count in roll_counts.items() if count > 1}
+        duplicate_emails = {email for email, count in email_counts.items() if count > 1}
+        
+        errors = []
+        seen_rolls = set()
+        seen_emails = set()
+        for i, (field_errors, roll, email) in enumerate(checked, start=1):
+            if field_errors:
+                errors.extend(f"Row {i}: {error}" for error in field_errors)
+                continue
+            
+            # Report every occurrence of a duplicate roll number after the first
+            if roll in duplicate_rolls:
+                if roll in seen_rolls:
+                    errors.append(f"Row {i}: Duplicate roll number '{roll}' in import data")
                 else:
-                    seen_rolls.add(student.roll)
-                
-                # Check for duplicate emails in the import data
-                if student.email in seen_emails:
-                    errors.append(f"Row {i}: Duplicate email '{student.email}' in import data")
+                    seen_rolls.add(roll)
+            
+            # Same for duplicate emails
+            if email in duplicate_emails:
+                if email in seen_emails:
+                    errors.append(f"Row {i}: Duplicate email '{email}' in import data")
                 else:
-                    seen_emails.add(student.email)
-                    
-            except ValueError as e:
-                errors.append(f"Row {i}: {str(e)}")
+                    seen_emails.add(email)
         
-        return errors
+        return errors, students
 
 
 class ReportGenerator:
@@ -183,6 +221,39 @@ class ReportGenerator:
     Generates various reports for the student management system.
     """
     
+    @staticmethod
+    def _to_columns(students: List[Student]) -> Dict[str, List[Any]]:
+        """
+        Pull the report fields out of the students into one list per field.
+        
+        Args:
+            students: List of Student objects
+            
+        Returns:
+            Dictionary mapping field name to a list with one value per student
+        """
+        return {
+            'name': [s.name for s in students],
+            'roll': [s.roll for s in students],
+            'department': [s.department for s in students],
+            'email': [s.email for s in students],
+            'phone': [s.phone for s in students]
+        }
+    
+    @staticmethod
+    def _summarize(students: List[Student]) -> Tuple[Counter, List[str]]:
+        """
+        Count students per department.
+        
+        Args:
+            students: List of Student objects
+            
+        Returns:
+            Tuple of (Counter of students per department, department names sorted)
+        """
+        counts = Counter(student.department for student in students)
+        return counts, sorted(counts)
+    
     @staticmethod
     def generate_department_report(students: List[Student]) -> str:
         """
@@ -197,38 +268,42 @@ class ReportGenerator:
         if not students:
             return "No students found."
         
-        # Group students by department
-        departments = {}
-        for student in students:
-            if student.department not in departments:
-                departments[student.department] = []
-            departments[student.department].append(student)
+        # Group student indices by department, reading each field column once
+        columns = ReportGenerator._to_columns(students)
+        names = columns['name']
+        rolls = columns['roll']
+        emails = columns['email']
+        phones = columns['phone']
+        departments = defaultdict(list)
+        for index, department in enumerate(columns['department']):
+            departments[department].append(index)
         
         # Generate report
-        report = []
-        report.append("=" * 60)
-        report.append("STUDENT MANAGEMENT SYSTEM - DEPARTMENT REPORT")
-        report.append("=" * 60)
-        report.append(f"Generated on: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Total Students: {len(students)}")
-        report.append(f"Total Departments: {len(departments)}")
-        report.append("")
+        buffer = io.StringIO()
+        write = buffer.write
+        write("=" * 60 + "\n")
+        write("STUDENT MANAGEMENT SYSTEM - DEPARTMENT REPORT\n")
+        write("=" * 60 + "\n")
+        write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"Total Students: {len(students)}\n")
+        write(f"Total Departments: {len(departments)}\n")
+        write("\n")
         
-        for department in sorted(departments.keys()):
-            dept_students = departments[department]
-            report.append(f"DEPARTMENT: {department}")
-            report.append("-" * 40)
-            report.append(f"Number of Students: {len(dept_students)}")
-            report.append("")
+        for department in sorted(departments):
+            indices = departments[department]
+            write(f"DEPARTMENT: {department}\n")
+            write("-" * 40 + "\n")
+            write(f"Number of Students: {len(indices)}\n")
+            write("\n")
             
-            for student in sorted(dept_students, key=lambda s: s.name):
-                report.append(f"  • {student.name} ({student.roll})")
-                report.append(f"    Email: {student.email}")
-                if student.phone:
-                    report.append(f"    Phone: {student.phone}")
-                report.append("")
+            # One write per student, blank line included
+            indices.sort(key=names.__getitem__)
+            for i in indices:
+                write(f"  • {names[i]} ({rolls[i]})\n    Email: {emails[i]}\n"
+                      + (f"    Phone: {phones[i]}\n\n" if phones[i] else "\n"))
         
-        return "\n".join(report)
+        # Drop the final newline so the report ends on its last blank line
+        return buffer.getvalue()[:-1]
     
     @staticmethod
     def generate_summary_report(students: List[Student]) -> str:
@@ -246,16 +321,14 @@ class ReportGenerator:
         
         # Calculate statistics
         total_students = len(students)
-        departments = {}
-        for student in students:
-            departments[student.department] = departments.get(student.department, 0) + 1
+        departments, department_names = ReportGenerator._summarize(students)
         
         # Generate report
         report = []
         report.append("=" * 50)
         report.append("STUDENT MANAGEMENT SYSTEM - SUMMARY REPORT")
         report.append("=" * 50)
-        report.append(f"Generated on: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        report.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         report.append("")
         report.append("OVERVIEW:")
         report.append(f"  Total Students: {total_students}")
@@ -264,7 +337,7 @@ class ReportGenerator:
         report.append("STUDENTS BY DEPARTMENT:")
         report.append("-" * 30)
         
-        for department in sorted(departments.keys()):
+        for department in department_names:
             count = departments[department]
             percentage = (count / total_students) * 100
             report.append(f"  {department}: {count} students ({percentage:.1f}%)")
@@ -278,13 +351,14 @@ class ValidationHelper:
     """
     
     @staticmethod
-    def validate_roll_number(roll: str, existing_rolls: List[str], exclude_roll: Optional[str] = None) -> bool:
+    def validate_roll_number(roll: str, existing_rolls: AbstractSet[str], exclude_roll: Optional[str] = None) -> bool:
         """
         Validate if roll number is unique.
         
         Args:
             roll: Roll number to validate
-            existing_rolls: List of existing roll numbers
+            existing_rolls: Set of existing roll numbers (a set keeps the check
+                a hash lookup; build it once when validating many rolls)
             exclude_roll: Roll number to exclude from check (for updates)
             
         Returns:
@@ -295,13 +369,14 @@ class ValidationHelper:
         return roll not in existing_rolls
     
     @staticmethod
-    def validate_email(email: str, existing_emails: List[str], exclude_email: Optional[str] = None) -> bool:
+    def validate_email(email: str, existing_emails: AbstractSet[str], exclude_email: Optional[str] = None) -> bool:
         """
         Validate if email is unique.
         
         Args:
             email: Email to validate
-            existing_emails: List of existing emails
+            existing_emails: Set of existing emails (a set keeps the check a
+                hash lookup; build it once when validating many emails)
             exclude_email: Email to exclude from check (for updates)
             
         Returns: